@@ -33,12 +33,17 @@ def main() -> int:
     args = parse_arguments()
 
     try:
-        # Parse CSV files and get Employee objects
-        employees_data = parse_csv_files(args.files, as_dataclass=True)
-
-        # Generate and print the report
-        report = generate_report(employees_data, args.report)
-        print(report)
+        # Parse CSV files into employee dictionaries, which the report
+        # generators read directly
+        employees_data = parse_csv_files(args.files)
+
+        # Generate the report and write it straight to stdout, pretty-printed
+        # only for an interactive terminal
+        generate_report(
+            employees_data, args.report, out=sys.stdout,
+            pretty=sys.stdout.isatty()
+        )
+        sys.stdout.write("\n")
 
         return 0
     except FileNotFoundError as e:
@@ -2,15 +2,32 @@
 CSV Parser module for reading and parsing employee data from CSV files.
 """
 
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import chain
+import csv
 import os
+import sys
 from .models import Employee
 
+# Number of CSV files below which they are always parsed in-process,
+# without looking at their sizes
+PARALLEL_PARSE_MIN_FILES = 4
+
+# Combined size of the CSV files above which they are parsed in parallel
+PARALLEL_PARSE_MIN_BYTES = 64 * 1024 * 1024
+
 
 def parse_csv_files(file_paths: List[str], as_dataclass: bool = False) -> Union[List[Dict[str, Any]], List[Employee]]:
     """
     Parse multiple CSV files containing employee data.
 
+    Several large files are parsed in parallel worker processes. On
+    platforms that start workers by spawning, such as Windows and macOS,
+    callers must then guard their entry point with
+    ``if __name__ == "__main__":``.
+
     Args:
         file_paths: List of paths to CSV files
         as_dataclass: If True, returns Employee objects instead of dictionaries
@@ -22,16 +39,61 @@ def parse_csv_files(file_paths: List[str], as_dataclass: bool = False) -> Union[
         FileNotFoundError: If any of the files doesn't exist
         ValueError: If there's an issue parsing the CSV data
     """
-    all_employees = []
+    max_workers = _parallel_workers(file_paths)
+    if max_workers <= 1:
+        return [
+            employee
+            for file_path in file_paths
+            for employee in parse_csv_file(file_path, as_dataclass)
+        ]
+
+    # Files are independent, so parse them in parallel worker processes
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(partial(parse_csv_file, as_dataclass=as_dataclass), file_paths)
+        employees = list(chain.from_iterable(results))
+
+    # Each worker's results are unpickled separately, so share the
+    # department strings across files again
+    for employee in employees:
+        if as_dataclass:
+            employee.department = sys.intern(employee.department)
+        elif 'department' in employee:
+            employee['department'] = sys.intern(employee['department'])
 
-    for file_path in file_paths:
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
+    return employees
 
-        employees = parse_csv_file(file_path, as_dataclass)
-        all_employees.extend(employees)
 
-    return all_employees
+def _parallel_workers(file_paths: List[str]) -> int:
+    """
+    Decide how many worker processes to parse the given files with.
+
+    Process start-up and pickling the parsed rows back to the parent only
+    pay off for several large files on a machine with more than one CPU.
+    The files are only stat'ed once there are enough of them for the pool
+    to be an option, and only until their sizes reach the threshold.
+
+    Args:
+        file_paths: List of paths to CSV files
+
+    Returns:
+        Number of worker processes, or 1 to parse the files in-process
+    """
+    if len(file_paths) < PARALLEL_PARSE_MIN_FILES:
+        return 1
+    max_workers = min(len(file_paths), os.cpu_count() or 1)
+    if max_workers <= 1:
+        return 1
+
+    total_size = 0
+    for file_path in file_paths:
+        try:
+            total_size += os.path.getsize(file_path)
+        except OSError:
+            # Let the in-process parse report missing or unreadable files
+            return 1
+        if total_size >= PARALLEL_PARSE_MIN_BYTES:
+            return max_workers
+    return 1
 
 
 def parse_csv_file(file_path: str, as_dataclass: bool = False) -> Union[List[Dict[str, Any]], List[Employee]]:
@@ -46,45 +108,40 @@ def parse_csv_file(file_path: str, as_dataclass: bool = False) -> Union[List[Dic
         List of dictionaries or Employee objects containing employee data
 
     Raises:
+        FileNotFoundError: If the file doesn't exist
         ValueError: If there's an issue parsing the CSV data
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-
-        if not lines:
-            return []
-
-        # Parse header
-        header = parse_csv_line(lines[0])
-
-        # Find the index of the hourly rate column (could be named differently)
-        rate_column_index = find_rate_column_index(header)
-        if rate_column_index is None:
-            raise ValueError(f"Could not find hourly rate column in {file_path}")
-
-        # Parse employee data
-        employees = []
-        for line in lines[1:]:
-            if line.strip():  # Skip empty lines
-                employee = parse_employee_line(line, header, rate_column_index)
-                employees.append(employee)
-
-        # Convert to Employee objects if requested
-        if as_dataclass:
-            return [
-                Employee(
-                    id=employee["id"],
-                    name=employee["name"],
-                    email=employee["email"],
-                    department=employee["department"],
-                    hours_worked=employee["hours_worked"],
-                    hourly_rate=employee["hourly_rate"]
-                )
-                for employee in employees
-            ]
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+            reader = csv.reader(file)
+
+            # Parse header
+            header = next(reader, None)
+            if header is None:
+                return []
+            header = [column_name.strip() for column_name in header]
+
+            # Find the index of the hourly rate column (could be named differently)
+            rate_column_index = find_rate_column_index(header)
+            if rate_column_index is None:
+                raise ValueError(f"Could not find hourly rate column in {file_path}")
+
+            # Resolve column positions once instead of per row
+            column_indices = get_column_indices(header, rate_column_index)
+
+            # Parse employee data row by row without loading the whole file,
+            # converting to Employee objects in the same pass if requested
+            employees = []
+            for row in reader:
+                if any(value.strip() for value in row):  # Skip empty lines
+                    employee = parse_employee_line(row, header, rate_column_index, column_indices)
+                    if as_dataclass:
+                        employee = Employee.from_dict(employee)
+                    employees.append(employee)
 
         return employees
+    except FileNotFoundError:
+        raise
     except Exception as e:
         raise ValueError(f"Error parsing CSV file {file_path}: {str(e)}")
 
@@ -110,48 +167,100 @@ def find_rate_column_index(header: List[str]) -> Optional[int]:
     Args:
         header: List of column names
 
+    Returns:
+        Index of the hourly rate column or None if not found
+    """
+    return _find_rate_column_index_cached(tuple(header))
+
+
+@lru_cache(maxsize=32)
+def _find_rate_column_index_cached(header: Tuple[str, ...]) -> Optional[int]:
+    """
+    Find the index of the hourly rate column, memoized by header.
+
+    Args:
+        header: Tuple of column names
+
     Returns:
         Index of the hourly rate column or None if not found
     """
     rate_column_names = ['hourly_rate', 'rate', 'salary']
+    header_names = set(header)
     for name in rate_column_names:
-        if name in header:
+        if name in header_names:
             return header.index(name)
     return None
 
 
-def parse_employee_line(line: str, header: List[str], rate_column_index: int) -> Dict[str, Any]:
+def get_column_indices(header: List[str], rate_column_index: int) -> Tuple[int, int, List[Tuple[str, int]]]:
     """
-    Parse a CSV line containing employee data.
+    Resolve the positions of the employee columns in the header.
 
     Args:
-        line: CSV line
         header: List of column names
         rate_column_index: Index of the hourly rate column
 
     Returns:
-        Dictionary containing employee data
+        Tuple of the id column index, the hours worked column index and
+        a list of (column name, index) pairs for the remaining string columns
 
     Raises:
-        ValueError: If there's an issue parsing the employee data
+        ValueError: If a required employee column is missing
     """
-    values = parse_csv_line(line)
+    for column_name in ('id', 'name', 'email', 'department', 'hours_worked'):
+        if column_name not in header:
+            raise ValueError(f"Could not find {column_name} column in header")
+
+    id_index = header.index('id')
+    hours_index = header.index('hours_worked')
+    string_columns = [
+        (column_name, i)
+        for i, column_name in enumerate(header)
+        if i not in (id_index, hours_index, rate_column_index)
+    ]
+    return id_index, hours_index, string_columns
+
+
+def parse_employee_line(
+    values: List[str],
+    header: List[str],
+    rate_column_index: int,
+    column_indices: Optional[Tuple[int, int, List[Tuple[str, int]]]] = None
+) -> Dict[str, Any]:
+    """
+    Parse a tokenized CSV row containing employee data.
+
+    Args:
+        values: List of values from a CSV row (see parse_csv_line)
+        header: List of column names
+        rate_column_index: Index of the hourly rate column
+        column_indices: Precomputed result of get_column_indices; computed
+            from the header if not given
 
+    Returns:
+        Dictionary containing employee data, with the hourly rate column
+        standardized to 'hourly_rate'
+
+    Raises:
+        ValueError: If there's an issue parsing the employee data
+    """
     if len(values) != len(header):
         raise ValueError(f"Number of values ({len(values)}) doesn't match header length ({len(header)})")
 
-    employee = {}
-    for i, column_name in enumerate(header):
-        # Convert numeric values
-        if column_name == 'id':
-            employee[column_name] = int(values[i])
-        elif column_name == 'hours_worked' or i == rate_column_index:
-            employee[column_name] = float(values[i])
-        else:
-            employee[column_name] = values[i]
-
-    # Standardize the hourly rate column name to 'hourly_rate'
-    if header[rate_column_index] != 'hourly_rate':
-        employee['hourly_rate'] = employee.pop(header[rate_column_index])
+    if column_indices is None:
+        column_indices = get_column_indices(header, rate_column_index)
+    id_index, hours_index, string_columns = column_indices
+
+    employee = {
+        'id': int(values[id_index]),
+        'hours_worked': float(values[hours_index]),
+        'hourly_rate': float(values[rate_column_index])
+    }
+    for column_name, i in string_columns:
+        employee[column_name] = values[i].strip()
+
+    # Department names repeat across employees, so share one string per name
+    if 'department' in employee:
+        employee['department'] = sys.intern(employee['department'])
 
     return employee
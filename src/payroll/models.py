@@ -3,10 +3,27 @@ Models module for defining data structures used in the payroll system.
 """
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Optional
 
 
-@dataclass
+def calculate_payout(hours_worked: float, hourly_rate: float) -> float:
+    """
+    Calculate the payout for the given hours and hourly rate.
+
+    This is the single place payout rules live; both Employee objects and
+    employee dictionaries are paid through it.
+
+    Args:
+        hours_worked: Hours worked by the employee
+        hourly_rate: Hourly rate of the employee
+
+    Returns:
+        Payout amount
+    """
+    return hours_worked * hourly_rate
+
+
+@dataclass(slots=True)
 class Employee:
     """
     Employee data structure.
@@ -26,6 +43,26 @@ class Employee:
     hours_worked: float
     hourly_rate: float
     
+    @classmethod
+    def from_dict(cls, employee: Dict[str, Any]) -> "Employee":
+        """
+        Create an Employee from a dictionary of employee data.
+        
+        Args:
+            employee: Dictionary containing employee data
+            
+        Returns:
+            Employee object
+        """
+        return cls(
+            id=employee["id"],
+            name=employee["name"],
+            email=employee["email"],
+            department=employee["department"],
+            hours_worked=employee["hours_worked"],
+            hourly_rate=employee["hourly_rate"]
+        )
+    
     def calculate_payout(self) -> float:
         """
         Calculate the payout for the employee.
@@ -33,4 +70,4 @@ class Employee:
         Returns:
             Payout amount
         """
-        return self.hours_worked * self.hourly_rate
\ No newline at end of file
+        return calculate_payout(self.hours_worked, self.hourly_rate)
\ No newline at end of file
@@ -2,91 +2,196 @@
 Report Generator module for generating different types of reports from employee data.
 """
 
-from typing import Dict, Type, List, Any, Optional, Union
-from .models import Employee
-from .report_protocols import ReportGenerator, PayoutReportGenerator
+import io
+import json
+import math
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Callable, List, Any, Optional, TextIO, Union
+from .models import Employee, calculate_payout
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Employees are passed to report generators as given to generate_report
+Employees = Union[List[Dict[str, Any]], List[Employee]]
+
+# Registry mapping report types to report generator functions. A generator
+# returns either a finished report string or a JSON-serializable report
+# object, which generate_report formats.
+ReportGeneratorFunc = Callable[[Employees], Any]
+_report_generators: Dict[str, ReportGeneratorFunc] = {}
+
+# Field order of the employee entries in the payout report
+_PAYOUT_KEYS = (
+    "id", "name", "email", "department", "hours_worked", "hourly_rate", "payout"
+)
+
+
+def register_report_generator(report_type: str) -> Callable[[ReportGeneratorFunc], ReportGeneratorFunc]:
+    """
+    Decorator for registering a report generator function.
 
+    Args:
+        report_type: Type of report (e.g., 'payout')
 
-class ReportGeneratorFactory:
+    Returns:
+        Decorator that registers the function and returns it unchanged
     """
-    Factory class for creating report generators.
+    def decorator(func: ReportGeneratorFunc) -> ReportGeneratorFunc:
+        _report_generators[report_type] = func
+        return func
+    return decorator
+
+
+def _dump_json(obj: Any, out: TextIO, pretty: bool = True) -> None:
     """
+    Write an object to a file-like object as JSON.
+
+    Uses orjson when it is installed, writing its output in one call, and
+    falls back to streaming through the standard library json module
+    otherwise or when orjson cannot encode the object (e.g. integers
+    outside the 64-bit range). Both backends write equivalent JSON with
+    non-ASCII text as-is, though not always byte-identical: float
+    exponents, for example, are written as 1e20 by orjson and 1e+20 by
+    json. The fallback rejects non-finite floats rather than writing them
+    as NaN (orjson would write them as null, so generators must not
+    produce them).
 
-    _generators: Dict[str, Type[ReportGenerator]] = {}
-
-    @classmethod
-    def register(cls, report_type: str, generator_class: Type[ReportGenerator]) -> None:
-        """
-        Register a report generator class.
-
-        Args:
-            report_type: Type of report (e.g., 'payout')
-            generator_class: Report generator class
-        """
-        cls._generators[report_type] = generator_class
-
-    @classmethod
-    def create(cls, report_type: str) -> ReportGenerator:
-        """
-        Create a report generator of the specified type.
-
-        Args:
-            report_type: Type of report to generate
-
-        Returns:
-            Report generator instance
-
-        Raises:
-            ValueError: If the report type is not supported
-        """
-        generator_class = cls._generators.get(report_type)
-        if not generator_class:
-            supported_reports = ", ".join(cls._generators.keys())
-            raise ValueError(
-                f"Unsupported report type: {report_type}. "
-                f"Supported types: {supported_reports or 'none'}"
-            )
+    Args:
+        obj: Object to serialize
+        out: File-like object to write to
+        pretty: If True, indent the output; otherwise emit compact JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else None
+        try:
+            data = orjson.dumps(obj, option=option)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            out.write(data.decode())
+            return
+
+    if pretty:
+        json.dump(obj, out, indent=2, ensure_ascii=False, allow_nan=False)
+    else:
+        json.dump(obj, out, separators=(",", ":"), ensure_ascii=False, allow_nan=False)
 
-        return generator_class()
 
+@register_report_generator("payout")
+def generate_payout_report(employees: Employees) -> Dict[str, Any]:
+    """
+    Generate a payout report.
 
-# Register report generators
-ReportGeneratorFactory.register("payout", PayoutReportGenerator)
+    Args:
+        employees: List of dictionaries or Employee objects containing employee data
 
-# For backward compatibility
-_report_generators = ReportGeneratorFactory._generators
+    Returns:
+        Payout report grouped by department
 
+    Raises:
+        ValueError: If any hours worked or hourly rate is not finite
+    """
+    # Calculate payout for each employee, keeping rows as plain tuples.
+    # Dictionaries are read directly instead of building Employee objects.
+    if employees and isinstance(employees[0], dict):
+        rows = [
+            (
+                employee["id"],
+                employee["name"],
+                employee["email"],
+                employee["department"],
+                employee["hours_worked"],
+                employee["hourly_rate"],
+                calculate_payout(employee["hours_worked"], employee["hourly_rate"])
+            )
+            for employee in employees
+        ]
+    else:
+        rows = [
+            (
+                employee.id,
+                employee.name,
+                employee.email,
+                employee.department,
+                employee.hours_worked,
+                employee.hourly_rate,
+                employee.calculate_payout()
+            )
+            for employee in employees
+        ]
 
-def generate_report(employees: Union[List[Dict[str, Any]], List[Employee]], report_type: str) -> str:
+    # Sort by department and then by name
+    rows.sort(key=itemgetter(3, 1))
+
+    # Calculate department totals, grouping the already sorted rows
+    report = {
+        "departments": [],
+        "total_payout": 0
+    }
+
+    for department, group in groupby(rows, key=itemgetter(3)):
+        dept_rows = list(group)
+        department_total = sum(map(itemgetter(6), dept_rows))
+        dept_employees = [dict(zip(_PAYOUT_KEYS, row)) for row in dept_rows]
+        report["departments"].append({
+            "name": department,
+            "employees": dept_employees,
+            "department_total": department_total
+        })
+        report["total_payout"] += department_total
+
+    # A NaN or infinite hours or rate value makes the total non-finite
+    if not math.isfinite(report["total_payout"]):
+        raise ValueError("Hours worked and hourly rates must be finite numbers")
+
+    return report
+
+
+def generate_report(
+    employees: Employees,
+    report_type: str,
+    out: Optional[TextIO] = None,
+    pretty: bool = True
+) -> Optional[str]:
     """
     Generate a report of the specified type.
 
     Args:
         employees: List of dictionaries or Employee objects containing employee data
         report_type: Type of report to generate
+        out: Optional file-like object to write the report to
+        pretty: If True, report objects are serialized as indented JSON;
+            otherwise as compact JSON. Reports generated as strings are
+            written unchanged.
 
     Returns:
-        Generated report as a string
+        Generated report as a string, or None if it was written to out
 
     Raises:
         ValueError: If the report type is not supported
     """
-    # Convert dictionaries to Employee objects if needed
-    if employees and not isinstance(employees[0], Employee):
-        employee_objects = [
-            Employee(
-                id=employee["id"],
-                name=employee["name"],
-                email=employee["email"],
-                department=employee["department"],
-                hours_worked=employee["hours_worked"],
-                hourly_rate=employee["hourly_rate"]
-            )
-            for employee in employees
-        ]
-    else:
-        employee_objects = employees
-
-    # Create a report generator and generate the report
-    generator = ReportGeneratorFactory.create(report_type)
-    return generator.generate(employee_objects)
+    generator = _report_generators.get(report_type)
+    if not generator:
+        supported_reports = ", ".join(_report_generators.keys())
+        raise ValueError(
+            f"Unsupported report type: {report_type}. "
+            f"Supported types: {supported_reports or 'none'}"
+        )
+
+    report = generator(employees)
+    if isinstance(report, str):
+        if out is None:
+            return report
+        out.write(report)
+        return None
+
+    # Serialize report objects straight into the sink when one is given
+    sink = out if out is not None else io.StringIO()
+    _dump_json(report, sink, pretty)
+    if out is None:
+        return sink.getvalue()
+    return None
@@ -0,0 +1,50 @@
+"""
+Shared fixtures for the payroll report generator tests.
+"""
+
+import os
+import pytest
+from src.payroll.csv_parser import parse_csv_files
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
+
+@pytest.fixture(scope="session")
+def real_data_file_paths():
+    """Fixture for real data file paths."""
+    file_paths = ["data/data1.csv", "data/data2.csv", "data/data3.csv"]
+
+    # Check if the files exist
+    for file_path in file_paths:
+        assert os.path.exists(file_path), f"Test data file {file_path} not found"
+
+    return file_paths
+
+
+@pytest.fixture(scope="session")
+def real_employees(real_data_file_paths):
+    """Fixture for the employee data parsed once from the real data files."""
+    return parse_csv_files(real_data_file_paths)
+
+
+def _index_report(report):
+    """Index a parsed payout report by department name."""
+    by_name = {department["name"]: department for department in report["departments"]}
+    return by_name, report["total_payout"]
+
+
+@pytest.fixture(scope="session")
+def parse_report():
+    """Fixture for a function that parses a JSON report."""
+    return _loads
+
+
+@pytest.fixture(scope="session")
+def index_report():
+    """Fixture for a function that indexes a parsed payout report by department."""
+    return _index_report
@@ -4,11 +4,13 @@ Tests for the CSV parser module.
 
 import os
 import pytest
+from src.payroll import csv_parser
 from src.payroll.csv_parser import (
     parse_csv_files,
     parse_csv_file,
     parse_csv_line,
     find_rate_column_index,
+    get_column_indices,
     parse_employee_line
 )
 
@@ -76,68 +78,50 @@ def expected_employee_with_rate():
 
 
 @pytest.fixture
-def temp_csv_file():
+def temp_csv_file(tmp_path):
     """Fixture for a temporary CSV file."""
-    file_path = "test_data.csv"
-    with open(file_path, "w") as f:
-        f.write("id,email,name,department,hours_worked,hourly_rate\n")
-        f.write("1,alice@example.com,Alice Johnson,Marketing,160,50\n")
-
-    yield file_path
-
-    # Clean up
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    file_path = tmp_path / "test_data.csv"
+    file_path.write_bytes(
+        b"id,email,name,department,hours_worked,hourly_rate\n"
+        b"1,alice@example.com,Alice Johnson,Marketing,160,50\n"
+    )
+    return str(file_path)
 
 
 @pytest.fixture
-def temp_empty_csv_file():
+def temp_empty_csv_file(tmp_path):
     """Fixture for a temporary empty CSV file."""
-    file_path = "empty.csv"
-    with open(file_path, "w") as f:
-        pass
-
-    yield file_path
-
-    # Clean up
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    file_path = tmp_path / "empty.csv"
+    file_path.write_bytes(b"")
+    return str(file_path)
 
 
 @pytest.fixture
-def temp_csv_file_no_rate():
+def temp_csv_file_no_rate(tmp_path):
     """Fixture for a temporary CSV file without a rate column."""
-    file_path = "no_rate.csv"
-    with open(file_path, "w") as f:
-        f.write("id,email,name,department,hours_worked\n")
-        f.write("1,alice@example.com,Alice Johnson,Marketing,160\n")
-
-    yield file_path
-
-    # Clean up
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    file_path = tmp_path / "no_rate.csv"
+    file_path.write_bytes(
+        b"id,email,name,department,hours_worked\n"
+        b"1,alice@example.com,Alice Johnson,Marketing,160\n"
+    )
+    return str(file_path)
 
 
 @pytest.fixture
-def temp_multiple_csv_files():
+def temp_multiple_csv_files(tmp_path):
     """Fixture for temporary multiple CSV files."""
-    file_paths = ["test_data1.csv", "test_data2.csv"]
-
-    with open(file_paths[0], "w") as f:
-        f.write("id,email,name,department,hours_worked,hourly_rate\n")
-        f.write("1,alice@example.com,Alice Johnson,Marketing,160,50\n")
-
-    with open(file_paths[1], "w") as f:
-        f.write("id,name,email,department,hours_worked,rate\n")
-        f.write("2,Bob Smith,bob@example.com,Design,150,40\n")
+    file_paths = [tmp_path / "test_data1.csv", tmp_path / "test_data2.csv"]
 
-    yield file_paths
+    file_paths[0].write_bytes(
+        b"id,email,name,department,hours_worked,hourly_rate\n"
+        b"1,alice@example.com,Alice Johnson,Marketing,160,50\n"
+    )
+    file_paths[1].write_bytes(
+        b"id,name,email,department,hours_worked,rate\n"
+        b"2,Bob Smith,bob@example.com,Design,150,40\n"
+    )
 
-    # Clean up
-    for file_path in file_paths:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+    return [str(file_path) for file_path in file_paths]
 
 
 @pytest.fixture
@@ -163,12 +147,6 @@ def expected_multiple_employees():
     ]
 
 
-@pytest.fixture
-def real_data_file_paths():
-    """Fixture for real data file paths."""
-    return ["data/data1.csv", "data/data2.csv", "data/data3.csv"]
-
-
 def test_parse_csv_line(csv_line, expected_csv_values):
     """Test parsing a CSV line."""
     assert parse_csv_line(csv_line) == expected_csv_values
@@ -186,26 +164,39 @@ def test_find_rate_column_index(header, expected_index, request):
     assert find_rate_column_index(header_fixture) == expected_index
 
 
-def test_parse_employee_line(csv_line, header_with_hourly_rate, expected_employee):
+def test_get_column_indices(header_with_salary):
+    """Test resolving the employee column positions in a header."""
+    assert get_column_indices(header_with_salary, 5) == (1, 4, [("department", 0), ("name", 2), ("email", 3)])
+
+
+def test_get_column_indices_missing_column(header_with_hourly_rate):
+    """Test that get_column_indices raises ValueError when a required column is missing."""
+    header = [column_name for column_name in header_with_hourly_rate if column_name != "hours_worked"]
+
+    with pytest.raises(ValueError):
+        get_column_indices(header, header.index("hourly_rate"))
+
+
+def test_parse_employee_line(expected_csv_values, header_with_hourly_rate, expected_employee):
     """Test parsing an employee line."""
     rate_column_index = 5
-    assert parse_employee_line(csv_line, header_with_hourly_rate, rate_column_index) == expected_employee
+    assert parse_employee_line(expected_csv_values, header_with_hourly_rate, rate_column_index) == expected_employee
 
 
 def test_parse_employee_line_with_different_rate_column(header_with_rate, expected_employee_with_rate):
     """Test parsing an employee line with a different rate column name."""
-    line = "4,David Lee,david@example.com,Engineering,180,70"
+    values = ["4", "David Lee", "david@example.com", "Engineering", "180", "70"]
     rate_column_index = 5
-    assert parse_employee_line(line, header_with_rate, rate_column_index) == expected_employee_with_rate
+    assert parse_employee_line(values, header_with_rate, rate_column_index) == expected_employee_with_rate
 
 
 def test_parse_employee_line_value_error(header_with_hourly_rate):
     """Test that parse_employee_line raises ValueError when values don't match header."""
-    line = "1,alice@example.com,Alice Johnson,Marketing,160"
+    values = ["1", "alice@example.com", "Alice Johnson", "Marketing", "160"]
     rate_column_index = 5
 
     with pytest.raises(ValueError):
-        parse_employee_line(line, header_with_hourly_rate, rate_column_index)
+        parse_employee_line(values, header_with_hourly_rate, rate_column_index)
 
 
 def test_parse_csv_file(temp_csv_file, expected_employee):
@@ -232,18 +223,76 @@ def test_parse_csv_files(temp_multiple_csv_files, expected_multiple_employees):
     assert result == expected_multiple_employees
 
 
+@pytest.fixture
+def temp_csv_files_same_department(tmp_path):
+    """Fixture for temporary CSV files that share a department."""
+    file_paths = [tmp_path / "design1.csv", tmp_path / "design2.csv"]
+
+    file_paths[0].write_bytes(
+        b"id,email,name,department,hours_worked,hourly_rate\n"
+        b"1,bob@example.com,Bob Smith,Design,150,40\n"
+    )
+    file_paths[1].write_bytes(
+        b"id,name,email,department,hours_worked,rate\n"
+        b"2,Carol Williams,carol@example.com,Design,170,60\n"
+    )
+
+    return [str(file_path) for file_path in file_paths]
+
+
+@pytest.fixture
+def force_parallel_parse(monkeypatch):
+    """Fixture that makes parse_csv_files use worker processes for any files."""
+    monkeypatch.setattr(csv_parser, "PARALLEL_PARSE_MIN_FILES", 2)
+    monkeypatch.setattr(csv_parser, "PARALLEL_PARSE_MIN_BYTES", 0)
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+
+
+@pytest.mark.parametrize("as_dataclass", [False, True])
+def test_parse_csv_files_parallel_matches_serial(temp_multiple_csv_files, as_dataclass, force_parallel_parse):
+    """Test that parsing files in worker processes gives the serial result."""
+    serial = [
+        employee
+        for file_path in temp_multiple_csv_files
+        for employee in parse_csv_file(file_path, as_dataclass)
+    ]
+    assert csv_parser._parallel_workers(temp_multiple_csv_files) == 2
+
+    assert parse_csv_files(temp_multiple_csv_files, as_dataclass) == serial
+
+
+def test_parse_csv_files_parallel_interns_departments(temp_csv_files_same_department, force_parallel_parse):
+    """Test that employees parsed in different workers share department strings."""
+    first, second = parse_csv_files(temp_csv_files_same_department)
+
+    assert first["department"] is second["department"]
+
+
+def test_parse_csv_files_small_files_parse_in_process(temp_multiple_csv_files):
+    """Test that small files are not sent to worker processes."""
+    assert csv_parser._parallel_workers(temp_multiple_csv_files) == 1
+
+
+def test_parse_csv_files_few_files_skip_stat(temp_multiple_csv_files, monkeypatch):
+    """Test that a few files are parsed in-process without stat'ing them."""
+    def fail_getsize(file_path):
+        raise AssertionError(f"unexpected stat of {file_path}")
+
+    monkeypatch.setattr(os.path, "getsize", fail_getsize)
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+
+    assert csv_parser._parallel_workers(temp_multiple_csv_files) == 1
+
+
 def test_parse_csv_files_file_not_found():
     """Test that parse_csv_files raises FileNotFoundError when a file is not found."""
     with pytest.raises(FileNotFoundError):
         parse_csv_files(["nonexistent.csv"])
 
 
+@pytest.mark.slow
 def test_parse_csv_files_with_real_data(real_data_file_paths):
     """Test parsing the real data files."""
-    # Check if the files exist
-    for file_path in real_data_file_paths:
-        assert os.path.exists(file_path), f"Test data file {file_path} not found"
-
     result = parse_csv_files(real_data_file_paths)
 
     # Check that we have the expected number of employees
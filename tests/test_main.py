@@ -2,145 +2,131 @@
 Tests for the main script.
 """
 
-import os
+import io
 import sys
 import pytest
-from unittest.mock import patch
-import json
-
-# Add the root directory to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from contextlib import redirect_stdout
 
 from main import parse_arguments, main
 
 
-@pytest.fixture
-def temp_csv_file():
-    """Fixture for a temporary CSV file."""
-    file_path = "test_main.csv"
-    with open(file_path, "w") as f:
-        f.write("id,email,name,department,hours_worked,hourly_rate\n")
-        f.write("1,alice@example.com,Alice Johnson,Marketing,160,50\n")
-
-    yield file_path
+TEMP_CSV_DATA = (
+    b"id,email,name,department,hours_worked,hourly_rate\n"
+    b"1,alice@example.com,Alice Johnson,Marketing,160,50\n"
+)
 
-    # Clean up
-    if os.path.exists(file_path):
-        os.remove(file_path)
 
+@pytest.fixture(scope="session")
+def temp_csv_file(tmp_path_factory):
+    """Fixture for a temporary CSV file, written once per test session."""
+    file_path = tmp_path_factory.mktemp("payroll") / "test_main.csv"
+    file_path.write_bytes(TEMP_CSV_DATA)
+    return str(file_path)
 
-@pytest.fixture
-def real_data_file_paths():
-    """Fixture for real data file paths."""
-    file_paths = ["data/data1.csv", "data/data2.csv", "data/data3.csv"]
 
-    # Check if the files exist
-    for file_path in file_paths:
-        assert os.path.exists(file_path), f"Test data file {file_path} not found"
-
-    return file_paths
+@pytest.fixture(scope="module")
+def main_happy_output(temp_csv_file):
+    """Fixture for the exit code and output of one successful main() run."""
+    # capsys is function scoped, so capture stdout manually
+    stdout = io.StringIO()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(sys, "argv", ['main.py', temp_csv_file, '--report', 'payout'])
+        with redirect_stdout(stdout):
+            exit_code = main()
+    return exit_code, stdout.getvalue()
 
 
 @pytest.mark.parametrize("files,report_type", [
     (['data1.csv'], 'payout'),
     (['data1.csv', 'data2.csv'], 'payout')
 ])
-def test_parse_arguments(files, report_type):
+def test_parse_arguments(files, report_type, monkeypatch):
     """Test parsing command line arguments."""
-    with patch('sys.argv', ['main.py'] + files + ['--report', report_type]):
-        args = parse_arguments()
-        assert args.files == files
-        assert args.report == report_type
+    monkeypatch.setattr(sys, "argv", ['main.py'] + files + ['--report', report_type])
+    args = parse_arguments()
+    assert args.files == files
+    assert args.report == report_type
 
 
-def test_main_success(temp_csv_file):
+def test_main_success(main_happy_output, parse_report, index_report):
     """Test the main function with valid arguments."""
-    with patch('sys.argv', ['main.py', temp_csv_file, '--report', 'payout']):
-        with patch('builtins.print') as mock_print:
-            exit_code = main()
+    exit_code, report_str = main_happy_output
 
-            # Check that the function returned success
-            assert exit_code == 0
+    # Check that the function returned success
+    assert exit_code == 0
 
-            # Check that something was printed
-            mock_print.assert_called_once()
+    # Check that the report is written as a single compact document,
+    # since captured stdout is not a terminal
+    assert report_str.endswith("\n")
+    assert report_str.count("\n") == 1
 
-            # Get the printed report
-            report_str = mock_print.call_args[0][0]
+    # Parse and index the JSON report
+    by_name, total_payout = index_report(parse_report(report_str.rstrip("\n")))
 
-            # Parse the JSON report
-            report = json.loads(report_str)
+    # Check the departments
+    assert set(by_name) == {"Marketing"}
 
-            # Check the structure
-            assert "departments" in report
-            assert "total_payout" in report
+    # Check the department
+    department = by_name["Marketing"]
+    assert len(department["employees"]) == 1
+    assert department["employees"][0]["name"] == "Alice Johnson"
+    assert department["employees"][0]["payout"] == 8000.0
+    assert department["department_total"] == 8000.0
 
-            # Check the departments
-            departments = report["departments"]
-            assert len(departments) == 1  # Only Marketing
+    # Check the total payout
+    assert total_payout == 8000.0
 
-            # Check the department
-            department = departments[0]
-            assert department["name"] == "Marketing"
-            assert len(department["employees"]) == 1
-            assert department["employees"][0]["name"] == "Alice Johnson"
-            assert department["employees"][0]["payout"] == 8000.0
-            assert department["department_total"] == 8000.0
 
-            # Check the total payout
-            assert report["total_payout"] == 8000.0
+def test_main_file_not_found(capsys, monkeypatch):
+    """Test the main function with a non-existent file."""
+    monkeypatch.setattr(sys, "argv", ['main.py', 'nonexistent.csv', '--report', 'payout'])
+    exit_code = main()
 
+    # Check that the function returned an error
+    assert exit_code == 1
+    assert capsys.readouterr().err.startswith("Error:")
 
-def test_main_file_not_found():
-    """Test the main function with a non-existent file."""
-    with patch('sys.argv', ['main.py', 'nonexistent.csv', '--report', 'payout']):
-        with patch('sys.stderr') as mock_stderr:
-            exit_code = main()
 
-            # Check that the function returned an error
-            assert exit_code == 1
+def test_main_missing_column(tmp_path, capsys, monkeypatch):
+    """Test the main function with a CSV file missing a required column."""
+    file_path = tmp_path / "missing_email.csv"
+    file_path.write_bytes(
+        b"id,name,department,hours_worked,rate\n"
+        b"1,Alice Johnson,Marketing,160,50\n"
+    )
+    monkeypatch.setattr(sys, "argv", ['main.py', str(file_path), '--report', 'payout'])
+    exit_code = main()
 
+    # Check that the function returned an error
+    assert exit_code == 1
+    assert capsys.readouterr().err.startswith("Error:")
 
-@pytest.mark.parametrize("report_type,expected_exit_code", [
-    ('payout', 0),
-    ('unsupported', 1)
-])
-def test_main_report_type(temp_csv_file, report_type, expected_exit_code):
-    """Test the main function with different report types."""
-    with patch('sys.argv', ['main.py', temp_csv_file, '--report', report_type]):
-        if expected_exit_code == 0:
-            with patch('builtins.print') as mock_print:
-                exit_code = main()
-                assert exit_code == expected_exit_code
-                mock_print.assert_called_once()
-        else:
-            with patch('sys.stderr') as mock_stderr:
-                exit_code = main()
-                assert exit_code == expected_exit_code
-
-
-def test_main_with_real_data(real_data_file_paths):
-    """Test the main function with real data files."""
-    with patch('sys.argv', ['main.py'] + real_data_file_paths + ['--report', 'payout']):
-        with patch('builtins.print') as mock_print:
-            exit_code = main()
 
-            # Check that the function returned success
-            assert exit_code == 0
+def test_main_unsupported_report_type(temp_csv_file, monkeypatch):
+    """Test that argparse rejects an unsupported report type with exit status 2.
 
-            # Check that something was printed
-            mock_print.assert_called_once()
+    The supported payout report is covered by test_main_success.
+    """
+    monkeypatch.setattr(sys, "argv", ['main.py', temp_csv_file, '--report', 'unsupported'])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 2
+
+
+@pytest.mark.slow
+def test_main_with_real_data(real_data_file_paths, capsys, parse_report, index_report, monkeypatch):
+    """Test the main function with real data files."""
+    monkeypatch.setattr(sys, "argv", ['main.py'] + real_data_file_paths + ['--report', 'payout'])
+    exit_code = main()
 
-            # Get the printed report
-            report_str = mock_print.call_args[0][0]
+    # Check that the function returned success
+    assert exit_code == 0
 
-            # Parse the JSON report
-            report = json.loads(report_str)
+    # Get the printed report
+    report_str = capsys.readouterr().out.rstrip("\n")
 
-            # Check the structure
-            assert "departments" in report
-            assert "total_payout" in report
+    # Parse and index the JSON report
+    by_name, _ = index_report(parse_report(report_str))
 
-            # Check that we have the expected number of departments
-            departments = report["departments"]
-            assert len(departments) == 5  # Marketing, Design, Engineering, Finance, HR
+    # Check that we have the expected departments
+    assert set(by_name) == {"Marketing", "Design", "Engineering", "Finance", "HR"}
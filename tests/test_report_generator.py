@@ -2,20 +2,50 @@
 Tests for the report generator module.
 """
 
+import io
 import json
 import pytest
-from src.payroll.models import Employee
+from src.payroll import report_generator
+from src.payroll.models import Employee, calculate_payout
 from src.payroll.report_generator import (
     generate_report,
-    ReportGeneratorFactory,
+    register_report_generator,
     _report_generators
 )
-from src.payroll.report_protocols import ReportGenerator
 
 
-@pytest.fixture
+# Employee objects are only read by the tests, so they are built once
+EMPLOYEES = (
+    Employee(
+        id=1,
+        name="Alice Johnson",
+        email="alice@example.com",
+        department="Marketing",
+        hours_worked=160.0,
+        hourly_rate=50.0
+    ),
+    Employee(
+        id=2,
+        name="Bob Smith",
+        email="bob@example.com",
+        department="Design",
+        hours_worked=150.0,
+        hourly_rate=40.0
+    ),
+    Employee(
+        id=3,
+        name="Carol Williams",
+        email="carol@example.com",
+        department="Design",
+        hours_worked=170.0,
+        hourly_rate=60.0
+    )
+)
+
+
+@pytest.fixture(scope="module")
 def employee_data():
-    """Fixture for employee data."""
+    """Fixture for employee data, shared read-only across the module's tests."""
     return [
         {
             "id": 1,
@@ -44,49 +74,16 @@ def employee_data():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def employee_objects():
-    """Fixture for employee objects."""
-    return [
-        Employee(
-            id=1,
-            name="Alice Johnson",
-            email="alice@example.com",
-            department="Marketing",
-            hours_worked=160.0,
-            hourly_rate=50.0
-        ),
-        Employee(
-            id=2,
-            name="Bob Smith",
-            email="bob@example.com",
-            department="Design",
-            hours_worked=150.0,
-            hourly_rate=40.0
-        ),
-        Employee(
-            id=3,
-            name="Carol Williams",
-            email="carol@example.com",
-            department="Design",
-            hours_worked=170.0,
-            hourly_rate=60.0
-        )
-    ]
-
-
-@pytest.fixture
-def real_data_file_paths():
-    """Fixture for real data file paths."""
-    return ["data/data1.csv", "data/data2.csv", "data/data3.csv"]
+    """Fixture for employee objects, shared read-only like employee_data."""
+    return EMPLOYEES
 
 
-class TestReportGenerator(ReportGenerator):
-    """Test report generator for testing."""
-
-    def generate(self, employees):
-        """Generate a test report."""
-        return "Test report"
+@pytest.fixture(scope="module")
+def payout_report_index(employee_data, parse_report, index_report):
+    """Fixture for the payout report of employee_data, indexed by department."""
+    return index_report(parse_report(generate_report(employee_data, "payout")))
 
 
 def test_employee_calculate_payout(employee_objects):
@@ -94,27 +91,34 @@ def test_employee_calculate_payout(employee_objects):
     assert employee_objects[0].calculate_payout() == 8000.0
 
 
-def test_report_generator_factory_register():
+def test_calculate_payout_matches_employee(employee_objects):
+    """Test that the shared payout formula matches Employee.calculate_payout."""
+    for employee in employee_objects:
+        assert calculate_payout(employee.hours_worked, employee.hourly_rate) == employee.calculate_payout()
+
+
+@pytest.mark.xdist_group("registry")
+def test_register_report_generator():
     """Test registering a report generator."""
-    # Save the original report generators
-    original_generators = _report_generators.copy()
+    assert "test" not in _report_generators
 
     try:
         # Register a test report generator
-        ReportGeneratorFactory.register("test", TestReportGenerator)
+        @register_report_generator("test")
+        def generate_test_report(employees):
+            """Generate a test report."""
+            return "Test report"
 
         # Check that it was registered
         assert "test" in _report_generators
-        assert _report_generators["test"] == TestReportGenerator
+        assert _report_generators["test"] is generate_test_report
 
         # Check that it works
-        generator = ReportGeneratorFactory.create("test")
-        assert isinstance(generator, TestReportGenerator)
-        assert generator.generate([]) == "Test report"
+        assert generate_report([], "test") == "Test report"
+        assert generate_report([], "test", pretty=False) == "Test report"
     finally:
-        # Restore the original report generators
-        _report_generators.clear()
-        _report_generators.update(original_generators)
+        # Unregister only the test report generator
+        _report_generators.pop("test", None)
 
 
 def test_generate_report_unsupported_type():
@@ -127,65 +131,144 @@ def test_generate_report_unsupported_type():
     ("Marketing", 1, 8000.0),
     ("Design", 2, 16200.0)
 ])
-def test_generate_payout_report_departments(employee_data, department, expected_employees, expected_total):
+def test_generate_payout_report_departments(payout_report_index, department, expected_employees, expected_total):
     """Test generating a payout report for specific departments."""
-    report = generate_report(employee_data, "payout")
-    report_data = json.loads(report)
+    by_name, _ = payout_report_index
 
     # Find the department in the report
-    dept = next((d for d in report_data["departments"] if d["name"] == department), None)
-    assert dept is not None
+    assert department in by_name
+    dept = by_name[department]
 
     # Check the department data
     assert len(dept["employees"]) == expected_employees
     assert dept["department_total"] == expected_total
 
 
-def test_generate_payout_report(employee_data):
+def test_generate_payout_report(employee_data, parse_report, index_report):
     """Test generating a payout report."""
     report = generate_report(employee_data, "payout")
 
-    # Parse the JSON report
-    report_data = json.loads(report)
-
-    # Check the structure
-    assert "departments" in report_data
-    assert "total_payout" in report_data
+    # Parse and index the JSON report
+    by_name, total_payout = index_report(parse_report(report))
 
     # Check the departments
-    departments = report_data["departments"]
-    assert len(departments) == 2  # Marketing and Design
-
-    # Check the department names
-    department_names = [dept["name"] for dept in departments]
-    assert "Marketing" in department_names
-    assert "Design" in department_names
+    assert set(by_name) == {"Marketing", "Design"}
 
     # Check the total payout
-    assert report_data["total_payout"] == 24200.0
+    assert total_payout == 24200.0
 
 
-def test_generate_report_with_real_data(real_data_file_paths):
-    """Test generating a report with real data."""
-    from src.payroll.csv_parser import parse_csv_files
+def test_generate_payout_report_from_dicts_matches_objects(employee_data, employee_objects):
+    """Test that dictionaries and Employee objects produce the same payout report."""
+    assert generate_report(employee_data, "payout") == generate_report(employee_objects, "payout")
 
-    # Parse the real data files
-    employees = parse_csv_files(real_data_file_paths)
 
-    # Generate a payout report
-    report = generate_report(employees, "payout")
+def test_generate_payout_report_to_sink(employee_data):
+    """Test that a payout report can be streamed to a file-like object."""
+    sink = io.StringIO()
+
+    assert generate_report(employee_data, "payout", out=sink) is None
+    assert sink.getvalue() == generate_report(employee_data, "payout")
+
+
+def test_generate_payout_report_streams_without_orjson(employee_data, monkeypatch):
+    """Test that the standard library fallback streams the report in pieces."""
+    monkeypatch.setattr(report_generator, "orjson", None)
+    writes = []
+
+    class RecordingSink(io.StringIO):
+        def write(self, text):
+            writes.append(text)
+            return super().write(text)
+
+    sink = RecordingSink()
+    generate_report(employee_data, "payout", out=sink)
+
+    assert len(writes) > 1
+    assert sink.getvalue() == generate_report(employee_data, "payout")
 
-    # Parse the JSON report
-    report_data = json.loads(report)
 
-    # Check the structure
-    assert "departments" in report_data
-    assert "total_payout" in report_data
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request, monkeypatch):
+    """Fixture that runs a test with each available JSON backend."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(report_generator, "orjson", None)
+    return request.param
+
+
+@pytest.mark.parametrize("pretty", [True, False])
+def test_generate_payout_report_non_ascii(json_backend, pretty):
+    """Test that both JSON backends write non-ASCII names identically."""
+    employees = [{
+        "id": 1,
+        "name": "Zoë Ångström",
+        "email": "zoe@example.com",
+        "department": "Café",
+        "hours_worked": 10.0,
+        "hourly_rate": 20.0
+    }]
+
+    report = generate_report(employees, "payout", pretty=pretty)
+
+    assert '"Zoë Ångström"' in report
+    assert '"Café"' in report
+    expected = {
+        True: (
+            '{\n  "departments": [\n    {\n      "name": "Café",\n      "employees": [\n'
+            '        {\n          "id": 1,\n          "name": "Zoë Ångström",\n'
+            '          "email": "zoe@example.com",\n          "department": "Café",\n'
+            '          "hours_worked": 10.0,\n          "hourly_rate": 20.0,\n'
+            '          "payout": 200.0\n        }\n      ],\n'
+            '      "department_total": 200.0\n    }\n  ],\n  "total_payout": 200.0\n}'
+        ),
+        False: (
+            '{"departments":[{"name":"Café","employees":[{"id":1,"name":"Zoë Ångström",'
+            '"email":"zoe@example.com","department":"Café","hours_worked":10.0,'
+            '"hourly_rate":20.0,"payout":200.0}],"department_total":200.0}],'
+            '"total_payout":200.0}'
+        ),
+    }[pretty]
+    assert report == expected
+
+
+def test_generate_payout_report_rejects_non_finite(json_backend, employee_data):
+    """Test that both JSON backends reject non-finite hourly rates."""
+    employees = [dict(employee_data[0], hourly_rate=float("nan"))]
+
+    with pytest.raises(ValueError):
+        generate_report(employees, "payout")
+
+
+def test_generate_payout_report_large_id(json_backend, employee_data):
+    """Test that both JSON backends write ids outside the 64-bit range."""
+    employees = [dict(employee_data[0], id=99999999999999999999)]
+
+    report = json.loads(generate_report(employees, "payout", pretty=False))
+
+    assert report["departments"][0]["employees"][0]["id"] == 99999999999999999999
+
+
+def test_generate_payout_report_compact(employee_data, parse_report):
+    """Test that a compact payout report contains the same data as a pretty one."""
+    compact = generate_report(employee_data, "payout", pretty=False)
+
+    assert "\n" not in compact
+    assert parse_report(compact) == parse_report(generate_report(employee_data, "payout"))
+
+
+@pytest.mark.slow
+def test_generate_report_with_real_data(real_employees, parse_report, index_report):
+    """Test generating a report with real data."""
+    # Generate a payout report
+    report = generate_report(real_employees, "payout")
+
+    # Parse and index the JSON report
+    by_name, total_payout = index_report(parse_report(report))
 
-    # Check that we have the expected number of departments
-    departments = report_data["departments"]
-    assert len(departments) == 5  # Marketing, Design, Engineering, Finance, HR
+    # Check that we have the expected departments
+    assert set(by_name) == {"Marketing", "Design", "Engineering", "Finance", "HR"}
 
     # Check that the total payout is correct
-    total_payout = sum(dept["department_total"] for dept in departments)
-    assert report_data["total_payout"] == total_payout
+    assert total_payout == sum(dept["department_total"] for dept in by_name.values())